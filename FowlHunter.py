@@ -1,7 +1,18 @@
 import pygame
 import random
+import asyncio
+import gzip
+import json
 import math
-from dataclasses import dataclass
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from dataclasses import dataclass, field
 
 pygame.init()
 
@@ -19,6 +30,21 @@ GRASS_GREEN = (34, 139, 34)     # Ground color
 DARK_GRASS  = (0, 100, 0)       # Dark green for grass blade outlines
 TITLE_COLOR = (204, 85, 0)      # Dark orange for title
 
+# Persistent high-score store
+HIGHSCORE_DB = "fowlhunter_scores.db"
+LEADERBOARD_SIZE = 3
+
+# Gameplay capture (F9 saves the last CAPTURE_SECONDS of low-res frames)
+CAPTURE_SECONDS = 30
+CAPTURE_DIR = "captures"
+
+# Gameplay telemetry output
+TELEMETRY_DIR = "telemetry"
+
+# How often the session's peak Surface memory is sampled when enabled
+# (each sample walks the whole game, a few ms with the capture ring)
+MEMORY_SAMPLE_SECONDS = 5
+
 @dataclass
 class DuckVariant:
     color: tuple
@@ -58,6 +84,125 @@ DUCK_VARIANTS = {
     )
 }
 
+_FONTS = {}
+# Fonts die with pygame.quit(); forget them so a later game gets fresh ones
+pygame.register_quit(_FONTS.clear)
+
+def get_font(size):
+    """Shared default-font instance per size, so rendered text caches hit across games."""
+    font = _FONTS.get(size)
+    if font is None:
+        font = _FONTS[size] = pygame.font.Font(None, size)
+    return font
+
+class SurfacePool:
+    """
+    Reusable Surfaces keyed by (size, flags), plus a cache of rendered text.
+    With accounting enabled, every Surface created through the pool (or
+    reported via track()) is counted per frame and grouped by call site.
+    """
+    def __init__(self, text_cache_size=128):
+        self._free = {}
+        self._text = {}
+        self.text_cache_size = text_cache_size
+        self.accounting = False
+        self.use_tracemalloc = False
+        self.frame_allocations = {}
+        self.last_frame_allocations = {}
+        self.total_allocations = {}
+        self.tracemalloc_stats = []
+        self._snapshot = None
+        self._started_tracemalloc = False
+
+    @staticmethod
+    def _key(size, flags):
+        return (tuple(size), flags & pygame.SRCALPHA)
+
+    def acquire(self, size, flags=0, site=None):
+        """Borrow a Surface; contents are whatever the last user left behind."""
+        free = self._free.get(self._key(size, flags))
+        if free:
+            return free.pop()
+        surface = pygame.Surface(size, flags)
+        if self.accounting:
+            self.track(site or self._caller(), surface)
+        return surface
+
+    def release(self, surface):
+        """Return a borrowed Surface so the next acquire() can reuse it."""
+        surface.set_alpha(None)
+        key = self._key(surface.get_size(), surface.get_flags())
+        self._free.setdefault(key, []).append(surface)
+
+    def render_text(self, font, text, antialias, color, site=None):
+        """font.render() that reuses the Surface while the text is unchanged."""
+        key = (font, text, antialias, color)
+        surface = self._text.pop(key, None)
+        if surface is None:
+            surface = font.render(text, antialias, color)
+            if self.accounting:
+                self.track(site or self._caller(), surface)
+            if len(self._text) >= self.text_cache_size:
+                del self._text[next(iter(self._text))]
+        # Re-insert so the dict stays in least-recently-used order
+        self._text[key] = surface
+        return surface
+
+    def track(self, site, *surfaces):
+        """Record Surfaces created outside the pool against a call site."""
+        if not self.accounting:
+            return
+        stats = self.frame_allocations.setdefault(site, [0, 0])
+        for surface in surfaces:
+            stats[0] += 1
+            stats[1] += surface.get_pitch() * surface.get_height()
+
+    @staticmethod
+    def _caller():
+        frame = sys._getframe(2)
+        return f"{frame.f_code.co_name}:{frame.f_lineno}"
+
+    def enable_accounting(self, use_tracemalloc=False):
+        self.accounting = True
+        self.use_tracemalloc = use_tracemalloc
+        if use_tracemalloc:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracemalloc = True
+            self._snapshot = tracemalloc.take_snapshot()
+
+    def disable_accounting(self):
+        # Leave tracemalloc running if someone else started it
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        self.accounting = False
+        self.use_tracemalloc = False
+        self._snapshot = None
+
+    def end_frame(self):
+        """Close the current frame's counters; returns {site: (count, bytes)}."""
+        if not self.accounting:
+            return {}
+        frame = {site: tuple(stats) for site, stats in self.frame_allocations.items()}
+        for site, (count, size) in frame.items():
+            total = self.total_allocations.setdefault(site, [0, 0])
+            total[0] += count
+            total[1] += size
+        self.last_frame_allocations = frame
+        self.frame_allocations = {}
+
+        if self.use_tracemalloc:
+            # Python-side allocations by line; pixel buffers live in SDL
+            snapshot = tracemalloc.take_snapshot().filter_traces(
+                [tracemalloc.Filter(True, __file__)]
+            )
+            self.tracemalloc_stats = snapshot.compare_to(self._snapshot, 'lineno')
+            self._snapshot = snapshot
+        return frame
+
+SURFACE_POOL = SurfacePool()
+
 class TitleScreen:
     """Handles the game's title screen display and animation."""
     def __init__(self, width, height):
@@ -69,7 +214,7 @@ class TitleScreen:
         self.ducks = []
         self.environment = Environment(width, height)
         
-        small_font = pygame.font.Font(None, 32)
+        small_font = get_font(32)
         duck_text = small_font.render("DUCK", False, TITLE_COLOR)
         hunter_text = small_font.render("HUNTER", False, TITLE_COLOR)
         
@@ -90,20 +235,35 @@ class TitleScreen:
             (start_text.get_width() * 2, start_text.get_height() * 2)
         )
         
+        self.leaderboard_surfaces = []
+
         self.spawn_timer = 0
         self.spawn_duck()
+
+    def set_leaderboard(self, entries):
+        """Pre-render the high-score lines so draw() only blits them."""
+        if not entries:
+            self.leaderboard_surfaces = []
+            return
+        small_font = get_font(32)
+        lines = ["HIGH SCORES"]
+        for rank, entry in enumerate(entries, start=1):
+            lines.append(f"{rank}. {entry.score}  R{entry.rounds}")
+        self.leaderboard_surfaces = [
+            small_font.render(line, False, (0, 0, 0)) for line in lines
+        ]
         
     def spawn_duck(self):
         spawn_type = random.choice(['top', 'side'])
         if spawn_type == 'top':
             x = random.randint(0, self.width)
             y = -50
-            duck = Duck('golden', (x, y))
+            duck = Duck('golden', (x, y), bounds=(self.width, self.height))
             duck.speed_y = abs(duck.speed_y)
         else:
             x = -50 if random.random() < 0.5 else self.width + 50
             y = random.randint(100, int(self.height * 0.6))
-            duck = Duck('golden', (x, y))
+            duck = Duck('golden', (x, y), bounds=(self.width, self.height))
             duck.speed_x = abs(duck.speed_x) if x < 0 else -abs(duck.speed_x)
         self.ducks.append(duck)
         
@@ -149,6 +309,13 @@ class TitleScreen:
         
         for duck in self.ducks:
             surface.blit(duck.image, duck.rect)
+
+        # High scores between the title and "Click to Start"
+        line_y = hunter_rect.bottom + 20
+        for line_surface in self.leaderboard_surfaces:
+            line_rect = line_surface.get_rect(centerx=self.width // 2, y=line_y)
+            surface.blit(line_surface, line_rect)
+            line_y += line_rect.height + 2
         
         import math
         pulse = abs(math.sin(self.timer * 0.05)) * 0.3 + 0.7
@@ -171,6 +338,7 @@ class Feather(pygame.sprite.Sprite):
             random.randint(200, 255)
         )
         pygame.draw.line(self.image, color, (3, 0), (3, 12), 2)
+        SURFACE_POOL.track("Feather", self.image)
         self.rect = self.image.get_rect(center=(x, y))
         self.x = float(x)
         self.y = float(y)
@@ -187,97 +355,178 @@ class Feather(pygame.sprite.Sprite):
         if self.lifetime <= 0:
             self.kill()
 
+class DuckSprites:
+    """
+    Palette-indexed duck frames (flying, hit, falling and their flips),
+    drawn once as a master set in the 'normal' palette, which doubles as
+    the 'normal' variant. Every other variant gets 8-bit copies of the
+    master frames carrying its own palette, so a new variant costs a
+    memcpy instead of a redraw and can be recolored in place.
+    """
+    # Palette slots; index 0 is the transparent colorkey
+    TRANSPARENT, BODY, WING, BILL, BILL_SHADE, BODY_SHADE, EYE, EYE_SHINE = range(8)
+
+    master = None
+    variants = {}
+
+    @staticmethod
+    def palette(variant):
+        bill_shade = tuple(max(0, c - 40) for c in variant.bill_color)
+        body_shade = tuple(max(0, c - 30) for c in variant.color)
+        return [
+            (255, 0, 255),
+            variant.color,
+            variant.wing_color,
+            variant.bill_color,
+            bill_shade,
+            body_shade,
+            (0, 0, 0),
+            (255, 255, 255),
+        ]
+
+    @classmethod
+    def _draw_base_duck(cls, surface, wing_offset=0):
+        pygame.draw.ellipse(surface, cls.BODY, (20, 15, 40, 30))
+        tail_points = [(15, 25), (25, 30), (15, 35)]
+        pygame.draw.polygon(surface, cls.BODY, tail_points)
+        wing_y = 20 + wing_offset
+        wing_points = [(25, wing_y), (45, wing_y - 5), (45, wing_y + 10), (25, wing_y + 15)]
+        pygame.draw.polygon(surface, cls.WING, wing_points)
+        pygame.draw.ellipse(surface, cls.BODY, (50, 15, 20, 18))
+        pygame.draw.circle(surface, cls.EYE, (63, 23), 2)
+        pygame.draw.circle(surface, cls.EYE_SHINE, (63, 22), 1)
+        bill_points = [(67, 24), (77, 23), (77, 26), (67, 27)]
+        pygame.draw.polygon(surface, cls.BILL, bill_points)
+        pygame.draw.line(surface, cls.BILL_SHADE, (67, 25), (77, 25), 1)
+        pygame.draw.ellipse(surface, cls.BODY_SHADE, (25, 18, 30, 20), 1)
+        if wing_offset >= 0:
+            pygame.draw.line(surface, cls.BILL, (30, 43), (35, 48), 2)
+            pygame.draw.line(surface, cls.BILL, (35, 48), (38, 46), 2)
+            pygame.draw.line(surface, cls.BILL, (35, 48), (32, 46), 2)
+            pygame.draw.line(surface, cls.BILL, (40, 43), (45, 48), 2)
+            pygame.draw.line(surface, cls.BILL, (45, 48), (48, 46), 2)
+            pygame.draw.line(surface, cls.BILL, (45, 48), (42, 46), 2)
+
+    @classmethod
+    def master_frames(cls):
+        """The palette-indexed master set as (frames, frames_flipped)."""
+        if cls.master is None:
+            base_surface = pygame.Surface((80, 60), 0, 8)
+            base_surface.set_palette(cls.palette(DUCK_VARIANTS['normal']))
+            base_surface.fill(cls.TRANSPARENT)
+            base_surface.set_colorkey(cls.TRANSPARENT)
+
+            frames = {}
+
+            # One drawing per distinct wing pose; repeated poses share it
+            poses = {}
+            for wpos in (0, -5, 5):
+                poses[wpos] = base_surface.copy()
+                cls._draw_base_duck(poses[wpos], wpos)
+
+            # Flying
+            frames['flying'] = [poses[wpos] for wpos in [0, -5, 0, 5]]
+
+            # Hit frames all show the first flying pose
+            frames['hit'] = [frames['flying'][0]] * 4
+
+            # Falling (the unrotated first frame is the wings-down pose)
+            frames['falling'] = [poses[5]] + [
+                pygame.transform.rotate(poses[5], i * 5) for i in range(1, 4)
+            ]
+
+            flipped = {}
+            for state_frames in frames.values():
+                for frame in state_frames:
+                    if id(frame) not in flipped:
+                        flipped[id(frame)] = pygame.transform.flip(frame, True, False)
+            frames_flipped = {
+                st: [flipped[id(frame)] for frame in state_frames]
+                for st, state_frames in frames.items()
+            }
+            cls.master = (frames, frames_flipped)
+            cls.variants['normal'] = cls.master
+        return cls.master
+
+    @classmethod
+    def frames_for(cls, variant_name):
+        """Shared (frames, frames_flipped) for a variant, built on first use."""
+        # The master set itself serves as 'normal'
+        master = cls.master_frames()
+        cached = cls.variants.get(variant_name)
+        if cached is None:
+            palette = cls.palette(DUCK_VARIANTS[variant_name])
+            # One copy per distinct master frame, so frames shared between
+            # states (the hit poses) stay shared in the copy
+            copied = {}
+            cached = []
+            for frames in master:
+                copies = {}
+                for st, state_frames in frames.items():
+                    for frame in state_frames:
+                        if id(frame) not in copied:
+                            copied[id(frame)] = frame.copy()
+                            copied[id(frame)].set_palette(palette)
+                    copies[st] = [copied[id(frame)] for frame in state_frames]
+                cached.append(copies)
+            SURFACE_POOL.track("DuckSprites", *copied.values())
+            cached = tuple(cached)
+            cls.variants[variant_name] = cached
+        return cached
+
+    @classmethod
+    def recolor(cls, variant_name, **colors):
+        """
+        Change a variant's colors (color, wing_color, bill_color) at runtime.
+        Ducks already on screen pick up the new palette immediately.
+        """
+        variant = DUCK_VARIANTS[variant_name]
+        for name, value in colors.items():
+            setattr(variant, name, value)
+        cached = cls.variants.get(variant_name)
+        if cached is not None:
+            palette = cls.palette(variant)
+            for frames in cached:
+                for state_frames in frames.values():
+                    for frame in state_frames:
+                        frame.set_palette(palette)
+
 class Duck(pygame.sprite.Sprite):
     """A duck that can fly, be hit, then fall off the screen."""
-    def __init__(self, variant_name='normal', start_pos=None):
+    def __init__(self, variant_name='normal', start_pos=None, velocity=None,
+                 bounds=(WINDOW_WIDTH, WINDOW_HEIGHT)):
         super().__init__()
+        # Play-field size of the game this duck belongs to
+        self.width, self.height = bounds
+        self.variant_name = variant_name
         self.variant = DUCK_VARIANTS[variant_name]
         self.state = 'flying'
         self.frame = 0
-        self.frames = self._create_animation_frames()
-        self.frames_flipped = {
-            st: [pygame.transform.flip(f, True, False) for f in frames]
-            for st, frames in self.frames.items()
-        }
+        self.frames, self.frames_flipped = DuckSprites.frames_for(variant_name)
 
         self.image = self.frames['flying'][0]
         self.rect = self.image.get_rect()
         self.hit_timer = 0
+        self.spawned_at = time.perf_counter()
 
         if start_pos:
             self.rect.x, self.rect.y = start_pos
         else:
             self.reset()
 
-        direction = random.choice([-1, 1])
-        angle = random.uniform(30, 60)
-        speed = self.variant.speed
-        rad = math.radians(angle)
-        self.speed_x = speed * math.cos(rad) * direction
-        self.speed_y = -speed * math.sin(rad) * 1.5
-
-    def _create_animation_frames(self):
-        frames = {'flying': [], 'hit': [], 'falling': []}
-        base_surface = pygame.Surface((80, 60), pygame.SRCALPHA)
-
-        def draw_base_duck(surface, wing_offset=0):
-            pygame.draw.ellipse(surface, self.variant.color, (20, 15, 40, 30))
-            tail_points = [(15, 25), (25, 30), (15, 35)]
-            pygame.draw.polygon(surface, self.variant.color, tail_points)
-            wing_y = 20 + wing_offset
-            wing_points = [(25, wing_y), (45, wing_y - 5), (45, wing_y + 10), (25, wing_y + 15)]
-            pygame.draw.polygon(surface, self.variant.wing_color, wing_points)
-            pygame.draw.ellipse(surface, self.variant.color, (50, 15, 20, 18))
-            pygame.draw.circle(surface, (0,0,0), (63, 23), 2)
-            pygame.draw.circle(surface, (255,255,255), (63, 22), 1)
-            bill_points = [(67, 24), (77, 23), (77, 26), (67, 27)]
-            pygame.draw.polygon(surface, self.variant.bill_color, bill_points)
-            pygame.draw.line(surface,
-                (max(0, self.variant.bill_color[0] - 40),
-                 max(0, self.variant.bill_color[1] - 40),
-                 max(0, self.variant.bill_color[2] - 40)),
-                (67, 25), (77, 25), 1
-            )
-            pygame.draw.ellipse(surface,
-                (max(0, self.variant.color[0] - 30),
-                 max(0, self.variant.color[1] - 30),
-                 max(0, self.variant.color[2] - 30)),
-                (25, 18, 30, 20), 1
-            )
-            if wing_offset >= 0:
-                foot_color = self.variant.bill_color
-                pygame.draw.line(surface, foot_color, (30, 43), (35, 48), 2)
-                pygame.draw.line(surface, foot_color, (35, 48), (38, 46), 2)
-                pygame.draw.line(surface, foot_color, (35, 48), (32, 46), 2)
-                pygame.draw.line(surface, foot_color, (40, 43), (45, 48), 2)
-                pygame.draw.line(surface, foot_color, (45, 48), (48, 46), 2)
-                pygame.draw.line(surface, foot_color, (45, 48), (42, 46), 2)
-
-        # Flying
-        wing_positions = [0, -5, 0, 5]
-        for wpos in wing_positions:
-            frame = base_surface.copy()
-            draw_base_duck(frame, wpos)
-            frames['flying'].append(frame)
-
-        # Hit
-        for _ in range(4):
-            hit_frame = frames['flying'][0].copy()
-            frames['hit'].append(hit_frame)
-
-        # Falling
-        falling_base = base_surface.copy()
-        draw_base_duck(falling_base, 5)
-        for i in range(4):
-            angle = i * 5
-            frame = pygame.transform.rotate(falling_base, angle)
-            frames['falling'].append(frame)
-
-        return frames
+        if velocity:
+            self.speed_x, self.speed_y = velocity
+        else:
+            direction = random.choice([-1, 1])
+            angle = random.uniform(30, 60)
+            speed = self.variant.speed
+            rad = math.radians(angle)
+            self.speed_x = speed * math.cos(rad) * direction
+            self.speed_y = -speed * math.sin(rad) * 1.5
 
     def reset(self):
-        self.rect.y = WINDOW_HEIGHT - 150
-        self.rect.x = random.randint(-100, WINDOW_WIDTH // 2)
+        self.rect.y = self.height - 150
+        self.rect.x = random.randint(-100, self.width // 2)
         self.state = 'flying'
         self.hit_timer = 0
         self.frame = 0
@@ -295,14 +544,14 @@ class Duck(pygame.sprite.Sprite):
             if self.rect.left < 0:
                 self.rect.left = 0
                 self.speed_x = -self.speed_x
-            if self.rect.right > WINDOW_WIDTH:
-                self.rect.right = WINDOW_WIDTH
+            if self.rect.right > self.width:
+                self.rect.right = self.width
                 self.speed_x = -self.speed_x
             if self.rect.bottom < 0:
                 self.kill()
                 return
-            if self.rect.bottom > WINDOW_HEIGHT - 100:
-                self.rect.bottom = WINDOW_HEIGHT - 100
+            if self.rect.bottom > self.height - 100:
+                self.rect.bottom = self.height - 100
                 if self.speed_y > 0:
                     self.speed_y = -self.speed_y
 
@@ -324,26 +573,37 @@ class Duck(pygame.sprite.Sprite):
             else:
                 self.image = self.frames['falling'][self.frame]
             self.rect.y += self.variant.speed * 2
-            if self.rect.bottom >= WINDOW_HEIGHT - 100:
+            if self.rect.bottom >= self.height - 100:
                 self.kill()
 
 class Explosion(pygame.sprite.Sprite):
     """Expanding circle explosion on mouse click."""
+    # Every explosion looks the same, so the frames are drawn once and shared
+    shared_frames = None
+
     def __init__(self, pos):
         super().__init__()
-        self.frames = []
-        for i in range(6):
-            surface = pygame.Surface((50, 50), pygame.SRCALPHA)
-            radius = 5 + i * 5
-            pygame.draw.circle(surface, (255, 0, 0), (25, 25), radius)
-            pygame.draw.circle(surface, (255, 165, 0), (25, 25), radius // 2)
-            self.frames.append(surface)
+        self.frames = self._build_frames()
 
         self.index = 0
         self.image = self.frames[self.index]
         self.rect = self.image.get_rect(center=pos)
         self.timer = 0
 
+    @classmethod
+    def _build_frames(cls):
+        if cls.shared_frames is None:
+            frames = []
+            for i in range(6):
+                surface = pygame.Surface((50, 50), pygame.SRCALPHA)
+                radius = 5 + i * 5
+                pygame.draw.circle(surface, (255, 0, 0), (25, 25), radius)
+                pygame.draw.circle(surface, (255, 165, 0), (25, 25), radius // 2)
+                frames.append(surface)
+            SURFACE_POOL.track("Explosion", *frames)
+            cls.shared_frames = frames
+        return cls.shared_frames
+
     def update(self):
         self.timer += 1
         if self.timer % 5 == 0:
@@ -355,16 +615,17 @@ class Explosion(pygame.sprite.Sprite):
 
 class Dog(pygame.sprite.Sprite):
     """Shows a dog at round-end."""
-    def __init__(self, mood):
+    def __init__(self, mood, width=WINDOW_WIDTH, height=WINDOW_HEIGHT):
         super().__init__()
         self.mood = mood
         self.image = pygame.Surface((120, 120), pygame.SRCALPHA)
         self.draw_dog(self.image)
+        SURFACE_POOL.track("Dog", self.image)
         self.rect = self.image.get_rect()
-        self.rect.centerx = WINDOW_WIDTH // 2
-        self.target_y = 610
+        self.rect.centerx = width // 2
+        self.target_y = height - 190
         self.speed_y = -5
-        self.rect.top = WINDOW_HEIGHT
+        self.rect.top = height
 
     def draw_dog(self, surface):
         fur_color    = (205, 133, 63)
@@ -454,6 +715,9 @@ class Environment:
     Handles background: sky, clouds, trees, and grass.
     Only the clouds move horizontally.
     """
+    # All clouds use the same image, shared by every Environment
+    shared_cloud_surface = None
+
     def __init__(self, width, height):
         self.width = width
         self.height = height
@@ -488,7 +752,10 @@ class Environment:
             arcs_for_tree = self._generate_tree_arcs(x, self.height - 100, scale)
             self.tree_foliage_arcs[i] = arcs_for_tree
 
-    def _create_cloud_surface(self):
+    @classmethod
+    def _create_cloud_surface(cls):
+        if cls.shared_cloud_surface is not None:
+            return cls.shared_cloud_surface
         cloud_surface = pygame.Surface((120, 80), pygame.SRCALPHA)
         pygame.draw.circle(cloud_surface, (255, 255, 255), (40, 40), 25)
         pygame.draw.circle(cloud_surface, (255, 255, 255), (70, 35), 20)
@@ -497,6 +764,7 @@ class Environment:
 
         pygame.draw.arc(cloud_surface, (220, 220, 220), (20, 25, 40, 20), 0, math.pi/2, 2)
         pygame.draw.arc(cloud_surface, (220, 220, 220), (50, 30, 35, 15), math.pi/2, math.pi, 2)
+        cls.shared_cloud_surface = cloud_surface
         return cloud_surface
 
     def _generate_tree_arcs(self, tree_x, tree_y, scale):
@@ -632,31 +900,765 @@ class Environment:
             pygame.draw.polygon(surface, foliage_color, points)
             base_y -= int(h_scaled * 0.7)
 
+@dataclass
+class LeaderboardEntry:
+    score: int
+    rounds: int
+    ducks_hit: int
+    ended: float
+    session_id: str = None
+
+@dataclass
+class DifficultyCurve:
+    """Tunable knobs for how rounds get harder."""
+    base_ducks: int = 3
+    ducks_growth: int = 1
+    max_ducks: int = 15
+    base_interval: int = 120      # ticks between spawn groups in round 1
+    interval_step: int = 8
+    min_interval: int = 60
+    base_double_chance: float = 0.33
+    double_chance_step: float = 0.03
+    max_double_chance: float = 0.6
+    variant_weights: dict = field(default_factory=lambda: {
+        'normal': 70, 'mallard': 20, 'golden': 8, 'ruby': 2
+    })
+    rare_bonus: float = 0.1       # per-round boost to every non-normal weight
+
+    def ducks(self, round_number):
+        return min(self.max_ducks, self.base_ducks + self.ducks_growth * (round_number - 1))
+
+    def spawn_interval(self, round_number):
+        return max(self.min_interval, self.base_interval - self.interval_step * (round_number - 1))
+
+    def double_chance(self, round_number):
+        return min(self.max_double_chance,
+                   self.base_double_chance + self.double_chance_step * (round_number - 1))
+
+    def weights(self, round_number):
+        boost = 1 + self.rare_bonus * (round_number - 1)
+        return {
+            name: weight if name == 'normal' else weight * boost
+            for name, weight in self.variant_weights.items()
+            if name in DUCK_VARIANTS
+        }
+
+@dataclass(frozen=True)
+class SpawnEntry:
+    tick: int
+    variant: str
+    start_pos: tuple
+    velocity: tuple
+
+@dataclass(frozen=True)
+class RoundPlan:
+    round: int
+    ducks: int
+    entries: tuple
+
+class RoundPlanner:
+    """
+    Precomputes each round's full spawn schedule from a seed and a
+    DifficultyCurve, so the same seed always replays the same round.
+    """
+    def __init__(self, seed=None, curve=None, width=WINDOW_WIDTH, height=WINDOW_HEIGHT):
+        self.seed = random.randrange(2 ** 32) if seed is None else seed
+        self.curve = curve or DifficultyCurve()
+        self.width = width
+        self.height = height
+
+    def plan(self, round_number):
+        rng = random.Random(f"{self.seed}:{round_number}")
+        curve = self.curve
+        ducks = curve.ducks(round_number)
+        interval = curve.spawn_interval(round_number)
+        double_chance = curve.double_chance(round_number)
+        weights = curve.weights(round_number)
+        names = list(weights)
+        weight_values = list(weights.values())
+
+        entries = []
+        tick = 0
+        remaining = ducks
+        while remaining:
+            tick += interval
+            count = 2 if remaining >= 2 and rng.random() < double_chance else 1
+            for _ in range(count):
+                variant = rng.choices(names, weights=weight_values)[0]
+                # Same start area and launch angles as Duck.reset()
+                start_pos = (rng.randint(-100, self.width // 2), self.height - 150)
+                direction = rng.choice([-1, 1])
+                rad = math.radians(rng.uniform(30, 60))
+                speed = DUCK_VARIANTS[variant].speed
+                velocity = (speed * math.cos(rad) * direction,
+                            -speed * math.sin(rad) * 1.5)
+                entries.append(SpawnEntry(tick, variant, start_pos, velocity))
+            remaining -= count
+        return RoundPlan(round_number, ducks, tuple(entries))
+
+    def prewarm(self, plan, font):
+        """Build everything the round will draw before its first frame."""
+        for variant in {entry.variant for entry in plan.entries}:
+            DuckSprites.frames_for(variant)
+        SURFACE_POOL.render_text(font, f"Round {plan.round}", True, (0, 0, 0))
+        SURFACE_POOL.render_text(font, f"Round {plan.round} Complete!", True, (0, 0, 0))
+
+class ScoreStore:
+    """
+    Persists per-session and per-round results in SQLite (WAL mode).
+    Writes are queued and committed in batches by a background thread so the
+    game loop never touches the disk. The top-N leaderboard lives in memory:
+    it is loaded once at startup with an indexed LIMIT query and updated
+    incrementally as sessions are recorded.
+    """
+    def __init__(self, path=HIGHSCORE_DB, top_n=LEADERBOARD_SIZE,
+                 batch_size=32, flush_interval=0.5):
+        self.path = path
+        self.top_n = top_n
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.session_id = uuid.uuid4().hex
+        self.session_started = time.time()
+
+        self._queue = queue.Queue()
+        self._leaderboard = []
+        self._lock = threading.Lock()
+        # Bumped whenever the cached leaderboard changes
+        self.version = 0
+        self.failed_writes = 0
+
+        conn = self._connect()
+        try:
+            self._create_tables(conn)
+            self._load_leaderboard(conn)
+        finally:
+            conn.close()
+
+        self._writer = threading.Thread(
+            target=self._writer_loop, name="ScoreStoreWriter", daemon=True
+        )
+        self._writer.start()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _create_tables(self, conn):
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                " id TEXT PRIMARY KEY, started REAL, ended REAL,"
+                " score INTEGER, rounds INTEGER, ducks_hit INTEGER)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rounds ("
+                " session_id TEXT, round INTEGER, score INTEGER,"
+                " ducks_hit INTEGER, ducks_per_round INTEGER, ended REAL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_sessions_score"
+                " ON sessions (score DESC)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_rounds_session"
+                " ON rounds (session_id)"
+            )
+
+    def _load_leaderboard(self, conn):
+        # Served by idx_sessions_score, so only top_n rows are read
+        rows = conn.execute(
+            "SELECT score, rounds, ducks_hit, ended, id FROM sessions"
+            " ORDER BY score DESC LIMIT ?", (self.top_n,)
+        ).fetchall()
+        self._leaderboard = [LeaderboardEntry(*row) for row in rows]
+
+    def _writer_loop(self):
+        conn = None
+        running = True
+        while running:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            batch = []
+            while True:
+                if item is None:
+                    running = False
+                else:
+                    batch.append(item)
+                if not running or len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                try:
+                    if conn is None:
+                        conn = self._connect()
+                    with conn:
+                        for sql, params in batch:
+                            conn.execute(sql, params)
+                except sqlite3.Error as e:
+                    # The batch is rolled back; keep going for later writes
+                    self.failed_writes += len(batch)
+                    print(f"ScoreStore: dropped {len(batch)} writes: {e}", file=sys.stderr)
+        if conn is not None:
+            conn.close()
+
+    def record_round(self, round_number, score, ducks_hit, ducks_per_round,
+                     session_id=None):
+        """Queue a finished round; never blocks on disk I/O."""
+        self._enqueue((
+            "INSERT INTO rounds VALUES (?, ?, ?, ?, ?, ?)",
+            (session_id or self.session_id, round_number, score, ducks_hit,
+             ducks_per_round, time.time())
+        ))
+
+    def record_session(self, score, rounds, ducks_hit, session_id=None, started=None):
+        """
+        Queue the session result and fold it into the cached leaderboard.
+        Recording the same session again replaces its earlier result, so a
+        store shared by several games can take updates as rounds finish.
+        """
+        session_id = session_id or self.session_id
+        ended = time.time()
+        self._enqueue((
+            "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?, ?)",
+            (session_id, started or self.session_started, ended,
+             score, rounds, ducks_hit)
+        ))
+        entry = LeaderboardEntry(score, rounds, ducks_hit, ended, session_id)
+        with self._lock:
+            board = self._leaderboard
+            for i, existing in enumerate(board):
+                if existing.session_id == session_id:
+                    del board[i]
+                    self.version += 1
+                    break
+            index = len(board)
+            while index > 0 and board[index - 1].score < score:
+                index -= 1
+            if index < self.top_n:
+                board.insert(index, entry)
+                del board[self.top_n:]
+                self.version += 1
+
+    def _enqueue(self, write):
+        self._queue.put(write)
+
+    def leaderboard(self):
+        """Return the cached top-N entries, highest score first."""
+        with self._lock:
+            return list(self._leaderboard)
+
+    def close(self):
+        """Flush pending writes and stop the writer thread."""
+        self._queue.put(None)
+        self._writer.join()
+
+    @classmethod
+    def open(cls, path=HIGHSCORE_DB, top_n=LEADERBOARD_SIZE):
+        """
+        Open the store at path, falling back to a MemoryScoreStore if the
+        database cannot be opened, so the game still starts from any directory.
+        """
+        try:
+            return cls(path, top_n)
+        except sqlite3.Error as e:
+            print(f"ScoreStore: cannot open {path} ({e}); scores will not be saved",
+                  file=sys.stderr)
+            return MemoryScoreStore(top_n)
+
+class MemoryScoreStore(ScoreStore):
+    """ScoreStore that keeps only the in-memory leaderboard: no file, no thread."""
+    def __init__(self, top_n=LEADERBOARD_SIZE):
+        self.top_n = top_n
+        self.session_id = uuid.uuid4().hex
+        self.session_started = time.time()
+        self._leaderboard = []
+        self._lock = threading.Lock()
+        self.version = 0
+        self.failed_writes = 0
+
+    def _enqueue(self, write):
+        pass
+
+    def close(self):
+        pass
+
+class GameplayRecorder:
+    """
+    Keeps the last CAPTURE_SECONDS of the pixelated low-res frame in a
+    preallocated ring of surfaces. save() writes the ring out as a gzip'd
+    raw RGB frame stream from a background thread.
+    """
+    def __init__(self, size, seconds=CAPTURE_SECONDS, fps=FPS, directory=CAPTURE_DIR):
+        self.size = size
+        self.fps = fps
+        self.directory = directory
+        # 24-bit slots: 120x200 frames take ~70 KB each
+        self.frames = [pygame.Surface(size, 0, 24) for _ in range(seconds * fps)]
+        self.index = 0
+        self.count = 0
+        self.captured = 0
+        self.capture_time = 0.0
+        self._saver = None
+
+    @property
+    def saving(self):
+        return self._saver is not None and self._saver.is_alive()
+
+    @property
+    def capture_cost_ms(self):
+        """Average time spent in capture() per frame, in milliseconds."""
+        if self.captured == 0:
+            return 0.0
+        return self.capture_time * 1000 / self.captured
+
+    def capture(self, surface):
+        """Copy one frame into the ring. Skipped while a save is reading it."""
+        if self.saving or not self.frames:
+            return
+        start = time.perf_counter()
+        self.frames[self.index].blit(surface, (0, 0))
+        self.index = (self.index + 1) % len(self.frames)
+        self.count = min(self.count + 1, len(self.frames))
+        self.captured += 1
+        self.capture_time += time.perf_counter() - start
+
+    def save(self):
+        """Start writing the buffered frames to disk; returns the file path."""
+        if self.saving or self.count == 0:
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(
+            self.directory, time.strftime("capture_%Y%m%d_%H%M%S.fhc.gz")
+        )
+        # Oldest frame first
+        start = (self.index - self.count) % len(self.frames)
+        ordered = [self.frames[(start + i) % len(self.frames)] for i in range(self.count)]
+        self._saver = threading.Thread(
+            target=self._write, args=(path, ordered), name="CaptureWriter", daemon=True
+        )
+        self._saver.start()
+        return path
+
+    def _write(self, path, frames):
+        width, height = self.size
+        with gzip.open(path, 'wb', compresslevel=1) as stream:
+            stream.write(f"FHCAP1 {width} {height} {self.fps} {len(frames)}\n".encode())
+            for frame in frames:
+                stream.write(pygame.image.tobytes(frame, "RGB"))
+
+    def wait(self):
+        """Block until any in-flight save has finished."""
+        if self._saver is not None:
+            self._saver.join()
+
+class Telemetry:
+    """
+    Structured gameplay events (shots, spawns, reloads, round transitions).
+    emit() only stores a tuple in a preallocated buffer; full buffers are
+    swapped out and written by a background thread to gzip'd JSONL files.
+    A file is rotated once its compressed size reaches max_file_bytes, and
+    only the newest max_files telemetry files in the directory are kept.
+    If the writer falls behind, or a batch cannot be written, events are
+    dropped and counted rather than blocking the frame.
+    """
+    FIELDS = ("ts", "event", "round", "x", "y", "hit", "variant",
+              "elapsed_ms", "frame_ms", "ammo", "score", "ducks_hit", "game")
+
+    def __init__(self, session_id, directory=TELEMETRY_DIR, capacity=4096,
+                 flush_interval=1.0, max_file_bytes=1 << 20, max_files=20,
+                 close_timeout=2.0):
+        self.session_id = session_id
+        self.directory = directory
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.max_file_bytes = max_file_bytes
+        self.max_files = max_files
+        self.close_timeout = close_timeout
+        # Counted separately so the game loop and the writer never share a counter
+        self._emit_dropped = 0
+        self._write_dropped = 0
+
+        self._buffer = [None] * capacity
+        self._count = 0
+        self._last_flush = time.perf_counter()
+        # Two buffers in total: one being filled, one free or being written
+        self._free = queue.Queue()
+        self._free.put([None] * capacity)
+        self._full = queue.Queue()
+
+        self._file = None
+        self._raw_file = None
+        self._file_index = 0
+        self._writer = threading.Thread(
+            target=self._writer_loop, name="TelemetryWriter", daemon=True
+        )
+        self._writer.start()
+
+    def emit(self, event, round=None, x=None, y=None, hit=None, variant=None,
+             elapsed_ms=None, frame_ms=None, ammo=None, score=None, ducks_hit=None,
+             game=None):
+        if self._count == self.capacity and not self._swap():
+            self._emit_dropped += 1
+            return
+        self._buffer[self._count] = (time.time(), event, round, x, y, hit, variant,
+                                     elapsed_ms, frame_ms, ammo, score, ducks_hit, game)
+        self._count += 1
+
+    @property
+    def dropped(self):
+        """Events lost to a full buffer or a failed write."""
+        return self._emit_dropped + self._write_dropped
+
+    def poll(self):
+        """Hand the buffer to the writer once flush_interval has passed."""
+        if self._count and time.perf_counter() - self._last_flush >= self.flush_interval:
+            self._swap()
+
+    def _swap(self):
+        try:
+            spare = self._free.get_nowait()
+        except queue.Empty:
+            return False
+        self._full.put((self._buffer, self._count))
+        self._buffer = spare
+        self._count = 0
+        self._last_flush = time.perf_counter()
+        return True
+
+    def _close_file(self):
+        if self._file is not None:
+            try:
+                self._file.close()
+            finally:
+                self._raw_file.close()
+                self._file = None
+
+    def _open_next_file(self):
+        self._close_file()
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(
+            self.directory,
+            f"telemetry_{self.session_id}_{self._file_index:04d}.jsonl.gz"
+        )
+        self._file_index += 1
+        # Keep the raw file so its position gives the compressed size
+        self._raw_file = open(path, 'wb')
+        self._file = gzip.GzipFile(fileobj=self._raw_file, mode='wb', compresslevel=6)
+        self._prune_files(keep=path)
+
+    def _prune_files(self, keep):
+        paths = [
+            os.path.join(self.directory, name) for name in os.listdir(self.directory)
+            if name.startswith("telemetry_") and name.endswith(".jsonl.gz")
+        ]
+        paths.sort(key=os.path.getmtime)
+        excess = len(paths) - self.max_files
+        for path in paths:
+            if excess <= 0:
+                break
+            if path != keep:
+                os.remove(path)
+                excess -= 1
+
+    def _writer_loop(self):
+        while True:
+            item = self._full.get()
+            if item is None:
+                break
+            buffer, count = item
+            lines = []
+            for row in buffer[:count]:
+                record = {k: v for k, v in zip(self.FIELDS, row) if v is not None}
+                lines.append(json.dumps(record, separators=(',', ':')))
+            chunk = ("\n".join(lines) + "\n").encode()
+            try:
+                if self._file is None or self._raw_file.tell() >= self.max_file_bytes:
+                    self._open_next_file()
+                self._file.write(chunk)
+            except OSError as e:
+                self._write_dropped += count
+                print(f"Telemetry: dropped {count} events: {e}", file=sys.stderr)
+                # Start a fresh file for the next batch
+                try:
+                    self._close_file()
+                except OSError:
+                    pass
+            # The buffer always goes back, or the game loop runs out of spares
+            self._free.put(buffer)
+        try:
+            self._close_file()
+        except OSError as e:
+            print(f"Telemetry: could not close file: {e}", file=sys.stderr)
+
+    def close(self):
+        """
+        Write out anything still buffered and stop the writer thread. Waits at
+        most close_timeout for the writer; whatever it cannot take is dropped.
+        """
+        if self._count:
+            if self._writer.is_alive():
+                self._full.put((self._buffer, self._count))
+                try:
+                    self._buffer = self._free.get(timeout=self.close_timeout)
+                except queue.Empty:
+                    pass
+            else:
+                self._emit_dropped += self._count
+            self._count = 0
+        self._full.put(None)
+        self._writer.join(self.close_timeout)
+
+class NullTelemetry:
+    """Drop-in for Telemetry that discards every event."""
+    dropped = 0
+
+    def emit(self, event, **fields):
+        pass
+
+    def poll(self):
+        pass
+
+    def close(self):
+        pass
+
+class LocalServiceStub:
+    """
+    Minimal line-delimited JSON service on localhost, standing in for the
+    leaderboard/telemetry/config backends in tests. Each request gets
+    responses[request['type']] (or {'ok': True}) back after `delay` seconds.
+    """
+    def __init__(self, responses=None, host='127.0.0.1', port=0, delay=0.0):
+        self.responses = responses or {}
+        self.host = host
+        self.port = port
+        self.delay = delay
+        self.received = []
+        self._server = None
+        self._writers = set()
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._writers):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader, writer):
+        self._writers.add(writer)
+        try:
+            async for line in reader:
+                request = json.loads(line)
+                self.received.append(request)
+                if self.delay:
+                    await asyncio.sleep(self.delay)
+                reply = self.responses.get(request.get('type'), {'ok': True})
+                writer.write(json.dumps(reply).encode() + b"\n")
+                await writer.drain()
+        except (asyncio.CancelledError, ConnectionError):
+            # Client went away or the stub is shutting down
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+async def service_request(host, port, payload, timeout=1.0):
+    """Send one JSON request to a local service and return its reply."""
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    try:
+        writer.write(json.dumps(payload).encode() + b"\n")
+        await writer.drain()
+        line = await asyncio.wait_for(reader.readline(), timeout)
+        return json.loads(line)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+class MemoryReport:
+    """
+    Snapshot of the Surfaces reachable from the given roots, grouped by the
+    class of the object holding them. A Surface referenced by several owners
+    is "shared" and counted once; distinct Surfaces with identical pixels
+    are "duplicated" and flagged as waste.
+    """
+    # Scratch buffers whose contents are expected to repeat
+    BUFFER_OWNERS = {'GameplayRecorder', 'SurfacePool'}
+    # Values that can never lead to a Surface
+    LEAF_TYPES = (type(None), bool, int, float, str, bytes)
+
+    def __init__(self, *roots, find_duplicates=True):
+        self.by_owner = {}
+        self.total_surfaces = 0
+        self.total_bytes = 0
+        self.shared_surfaces = 0
+        self.shared_bytes_saved = 0
+        self.duplicate_groups = []
+        self.duplicate_bytes = 0
+
+        refs, instances = self._walk(roots)
+        for surface, owners in refs.values():
+            size = surface.get_pitch() * surface.get_height()
+            self.total_surfaces += 1
+            self.total_bytes += size
+            if len(owners) > 1:
+                self.shared_surfaces += 1
+                self.shared_bytes_saved += size * (len(owners) - 1)
+            for name in {name for name, _ in owners}:
+                stats = self.by_owner.setdefault(
+                    name, {'instances': len(instances[name]), 'surfaces': 0, 'bytes': 0}
+                )
+                stats['surfaces'] += 1
+                stats['bytes'] += size
+
+        if find_duplicates:
+            groups = {}
+            for surface, owners in refs.values():
+                if all(name in self.BUFFER_OWNERS for name, _ in owners):
+                    continue
+                key = (surface.get_size(), pygame.image.tobytes(surface, "RGBA"))
+                groups.setdefault(key, []).append(surface)
+            for surfaces in groups.values():
+                if len(surfaces) > 1:
+                    self.duplicate_groups.append(surfaces)
+                    first = surfaces[0]
+                    self.duplicate_bytes += (
+                        first.get_pitch() * first.get_height() * (len(surfaces) - 1)
+                    )
+
+    @staticmethod
+    def _walk(roots):
+        refs = {}        # id(surface) -> (surface, {(owner class, owner id)})
+        instances = {}   # owner class -> {owner id}
+        seen = set()
+        stack = [(root, None) for root in roots]
+        while stack:
+            obj, owner = stack.pop()
+            if isinstance(obj, pygame.Surface):
+                if owner is not None:
+                    refs.setdefault(id(obj), (obj, set()))[1].add(owner)
+                continue
+            # Owners are walked once; containers once per owner, so a shared
+            # container (e.g. a variant's frames dict) credits every owner
+            is_owner = isinstance(obj, type) or type(obj).__module__ == __name__
+            key = id(obj) if is_owner else (id(obj), owner)
+            if key in seen:
+                continue
+            seen.add(key)
+
+            if isinstance(obj, type):
+                # Class-level caches such as DuckSprites
+                owner = (obj.__name__, id(obj))
+                children = [v for k, v in vars(obj).items() if not k.startswith('__')]
+            elif isinstance(obj, (list, tuple, set, frozenset)):
+                children = obj
+            elif isinstance(obj, dict):
+                children = obj.values()
+            elif isinstance(obj, pygame.sprite.AbstractGroup):
+                children = obj.sprites()
+            elif type(obj).__module__ == __name__:
+                owner = (type(obj).__name__, id(obj))
+                children = vars(obj).values()
+            else:
+                continue
+
+            if owner is not None:
+                instances.setdefault(owner[0], set()).add(owner[1])
+            leaf_types = MemoryReport.LEAF_TYPES
+            stack.extend((child, owner) for child in children
+                         if not isinstance(child, leaf_types))
+        return refs, instances
+
+    def format(self, peak_bytes=None):
+        mb = 1024 * 1024
+        header = f"Surface memory: {self.total_surfaces} surfaces, {self.total_bytes / mb:.1f} MB"
+        if peak_bytes is not None:
+            header += f" (peak {peak_bytes / mb:.1f} MB)"
+        lines = [header]
+        for name, stats in sorted(self.by_owner.items(), key=lambda item: -item[1]['bytes']):
+            lines.append(
+                f"  {name:<18} {stats['instances']:>4} x {stats['surfaces']:>5} surfaces"
+                f" {stats['bytes'] / mb:>8.2f} MB"
+            )
+        lines.append(
+            f"Shared: {self.shared_surfaces} surfaces with several owners"
+            f" (saves {self.shared_bytes_saved / mb:.2f} MB)"
+        )
+        duplicated = sum(len(group) for group in self.duplicate_groups)
+        lines.append(
+            f"Duplicated: {duplicated} surfaces in {len(self.duplicate_groups)} identical groups"
+            f" (wastes {self.duplicate_bytes / mb:.2f} MB)"
+        )
+        return "\n".join(lines)
+
+def assert_memory_within(max_bytes, *roots, max_surfaces=None):
+    """Test helper: fail with the full report if the roots hold too much."""
+    report = MemoryReport(*roots, find_duplicates=False)
+    too_big = report.total_bytes > max_bytes
+    too_many = max_surfaces is not None and report.total_surfaces > max_surfaces
+    if too_big or too_many:
+        raise AssertionError(
+            f"Surface memory over budget ({max_bytes} bytes"
+            f"{f', {max_surfaces} surfaces' if max_surfaces is not None else ''}):\n"
+            + report.format()
+        )
+    return report
+
 class DuckHunt:
-    """Main Duck Hunt game controller with pixelation, bigger text, and round intro."""
-    def __init__(self):
-        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-        pygame.display.set_caption("Duck Hunter")
+    """
+    Main Duck Hunt game controller with pixelation, bigger text, and round intro.
+
+    The game plays on a width x height field. Without a target it opens its
+    own window; with one (e.g. a region of a KioskHost display) it renders
+    there, scaled to the target's size, and leaves the display alone.
+
+    scores and telemetry may be passed in (and are then left open by
+    close()), e.g. to share one store between kiosk games; otherwise they
+    are created here, on disk when persist is true and as in-memory/no-op
+    stand-ins when it is false. game_id tags this game's telemetry.
+    """
+    def __init__(self, width=WINDOW_WIDTH, height=WINDOW_HEIGHT, target=None,
+                 capture_seconds=CAPTURE_SECONDS, scores=None, telemetry=None,
+                 persist=True, sample_memory=False, game_id=None):
+        self.width = width
+        self.height = height
+        self.owns_display = target is None
+        if self.owns_display:
+            self.screen = pygame.display.set_mode((width, height))
+            pygame.display.set_caption("Duck Hunter")
+        else:
+            self.screen = target
         self.clock = pygame.time.Clock()
         
         # Bigger font for more readable text
-        self.font = pygame.font.Font(None, 64)
+        self.font = get_font(64)
         
         # We'll render everything to this temp_surface, then pixelate it
-        self.temp_surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+        self.temp_surface = pygame.Surface((width, height))
 
         self.score = 0
-        self.environment = Environment(WINDOW_WIDTH, WINDOW_HEIGHT)
+        self.environment = Environment(width, height)
         self.ducks = pygame.sprite.Group()
         self.feathers = pygame.sprite.Group()
         self.explosions = pygame.sprite.Group()
 
         self.round = 1
-        self.spawn_timer = 0
         self.game_state = 'title'
         self.ducks_per_round = 3
         self.ducks_spawned = 0
         self.ducks_hit = 0
+        self.session_ducks_hit = 0
         self.flash_timer = 0
 
         # Ammo system
@@ -669,17 +1671,94 @@ class DuckHunt:
         # NEW: Timer to flash "Right click to reload!"
         self.reload_flash_timer = 0
 
-        self.title_screen = TitleScreen(WINDOW_WIDTH, WINDOW_HEIGHT)
+        # Persistent leaderboard; all disk writes happen on a background thread
+        self.game_id = game_id
+        self.session_id = uuid.uuid4().hex
+        self.session_started = time.time()
+        self._owns_scores = scores is None
+        if scores is None:
+            scores = ScoreStore.open() if persist else MemoryScoreStore()
+        self.scores = scores
+        self._owns_telemetry = telemetry is None
+        if telemetry is None:
+            telemetry = Telemetry(self.session_id) if persist else NullTelemetry()
+        self.telemetry = telemetry
+        self.empty_since = None
+
+        # Spawn schedule for the current round, precomputed at round start
+        self.planner = RoundPlanner(width=width, height=height)
+        self.round_plan = None
+        self.round_tick = 0
+        self.spawn_delay = 0
+        self.next_spawn = 0
+
+        self.title_screen = TitleScreen(width, height)
+        self.leaderboard_version = None
+        self.refresh_leaderboard()
         self.dog = None
 
-    def spawn_duck(self):
-        variant = random.choices(list(DUCK_VARIANTS.keys()),
-                                 weights=[70, 20, 8, 2])[0]
-        duck = Duck(variant)
+        # Ring buffer of the pixelated frames for highlight capture
+        self.recorder = GameplayRecorder(
+            (width // PIXEL_SCALE, height // PIXEL_SCALE), seconds=capture_seconds
+        )
+
+        # Background coroutines for run_async()
+        self._loop = None
+        self._tasks = set()
+        self._pending_coroutines = []
+
+        # Surface memory peak; periodic sampling is opt-in, F10 always
+        # prints a report (and counts towards the peak)
+        self.sample_memory = sample_memory
+        self.memory_sample_timer = 0
+        self.memory_peak = 0
+
+    def memory_roots(self):
+        """Everything that can hold Surfaces for this game."""
+        return (self, DuckSprites, Explosion, Environment, SURFACE_POOL)
+
+    def memory_report(self, find_duplicates=True):
+        report = MemoryReport(*self.memory_roots(), find_duplicates=find_duplicates)
+        self.memory_peak = max(self.memory_peak, report.total_bytes)
+        return report
+
+    def start_round(self):
+        """Plan the current round's spawns and reset the per-round state."""
+        self.round_plan = self.planner.plan(self.round)
+        self.planner.prewarm(self.round_plan, self.font)
+        self.ducks_per_round = self.round_plan.ducks
+        self.round_tick = 0
+        self.spawn_delay = 0
+        self.next_spawn = 0
+        self.ducks_spawned = 0
+        self.ducks_hit = 0
+        self.game_state = 'playing'
+        self.dog = None
+        self.ammo = self.max_ammo
+        self.round_show_timer = 120  # Show "Round X" for ~2 seconds
+        # A fresh magazine ends any empty-gun wait from the last round
+        self.empty_since = None
+        self.telemetry.emit("round_start", game=self.game_id, round=self.round,
+                            score=self.score)
+
+    def spawn_duck(self, entry):
+        duck = Duck(entry.variant, entry.start_pos, entry.velocity,
+                    bounds=(self.width, self.height))
         self.ducks.add(duck)
+        self.ducks_spawned += 1
+        self.telemetry.emit("spawn", game=self.game_id, round=self.round,
+                            x=duck.rect.centerx, y=duck.rect.centery,
+                            variant=entry.variant)
+
+    def refresh_leaderboard(self):
+        """Re-render the title screen's high scores if the store has changed."""
+        if self.leaderboard_version != self.scores.version:
+            self.leaderboard_version = self.scores.version
+            self.title_screen.set_leaderboard(self.scores.leaderboard())
 
     def update(self):
         if self.game_state == 'title':
+            self.refresh_leaderboard()
             self.title_screen.update()
         else:
             self.environment.update()
@@ -700,25 +1779,33 @@ class DuckHunt:
                 self.reload_flash_timer -= 1
 
             if self.game_state == 'playing':
-                self.spawn_timer += 1
-                if self.spawn_timer >= 120 and self.ducks_spawned < self.ducks_per_round:
-                    self.spawn_timer = 0
+                self.round_tick += 1
+                entries = self.round_plan.entries
+                if (self.next_spawn < len(entries) and
+                        self.round_tick - self.spawn_delay >= entries[self.next_spawn].tick):
                     if len(self.ducks) < 2:
-                        if random.random() < 0.33 and (self.ducks_spawned + 1) < self.ducks_per_round:
-                            self.spawn_duck()
-                            self.spawn_duck()
-                            self.ducks_spawned += 2
-                        else:
-                            self.spawn_duck()
-                            self.ducks_spawned += 1
+                        # Spawn the whole group (single or double) due this tick
+                        due = entries[self.next_spawn].tick
+                        while self.next_spawn < len(entries) and entries[self.next_spawn].tick == due:
+                            self.spawn_duck(entries[self.next_spawn])
+                            self.next_spawn += 1
+                    else:
+                        # Screen is busy; hold the schedule until a duck leaves
+                        self.spawn_delay += 1
 
                 if self.ducks_spawned == self.ducks_per_round and len(self.ducks) == 0:
                     self.game_state = 'round_end'
-                    self.spawn_timer = 0
+                    self.scores.record_round(self.round, self.score,
+                                             self.ducks_hit, self.ducks_per_round,
+                                             session_id=self.session_id)
+                    # Keep the (possibly shared) leaderboard current mid-session
+                    self.record_session()
+                    self.telemetry.emit("round_end", game=self.game_id, round=self.round,
+                                        score=self.score, ducks_hit=self.ducks_hit)
 
             if self.game_state == 'round_end' and self.dog is None:
                 mood = "happy" if self.ducks_hit >= self.ducks_per_round / 2 else "sad"
-                self.dog = Dog(mood)
+                self.dog = Dog(mood, self.width, self.height)
 
             if self.dog:
                 self.dog.update()
@@ -736,59 +1823,67 @@ class DuckHunt:
             self.explosions.draw(self.temp_surface)
 
             # Score in top-left corner
-            score_text = self.font.render(f'Score: {self.score}', True, (0, 0, 0))
+            score_text = SURFACE_POOL.render_text(self.font, f'Score: {self.score}', True, (0, 0, 0))
             self.temp_surface.blit(score_text, (10, 10))
 
             # Ammo in top-left corner (below score)
             bars = "|" * self.ammo
-            ammo_text = self.font.render(f"Ammo: {bars}", True, (0, 0, 0))
+            ammo_text = SURFACE_POOL.render_text(self.font, f"Ammo: {bars}", True, (0, 0, 0))
             self.temp_surface.blit(ammo_text, (10, 80))
 
             # If out of ammo, flash "Right click to reload!"
             if self.reload_flash_timer > 0:
-                reload_text = self.font.render("Right click to reload!", True, (255, 0, 0))
-                rt_rect = reload_text.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//2))
+                reload_text = SURFACE_POOL.render_text(self.font, "Right click to reload!", True, (255, 0, 0))
+                rt_rect = reload_text.get_rect(center=(self.width//2, self.height//2))
                 self.temp_surface.blit(reload_text, rt_rect)
 
             # Show "Round X" in center ONLY if round_show_timer > 0
             if self.round_show_timer > 0:
-                round_center_text = self.font.render(f"Round {self.round}", True, (0, 0, 0))
-                rc_rect = round_center_text.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//2 - 80))
+                round_center_text = SURFACE_POOL.render_text(self.font, f"Round {self.round}", True, (0, 0, 0))
+                rc_rect = round_center_text.get_rect(center=(self.width//2, self.height//2 - 80))
                 self.temp_surface.blit(round_center_text, rc_rect)
 
             if self.game_state == 'round_end':
-                end_text = self.font.render(f'Round {self.round} Complete!', True, (0, 0, 0))
-                continue_text = self.font.render('Tap to continue', True, (0, 0, 0))
-                text_rect = end_text.get_rect(center=(WINDOW_WIDTH / 2, WINDOW_HEIGHT / 2))
-                cont_rect = continue_text.get_rect(center=(WINDOW_WIDTH / 2, WINDOW_HEIGHT / 2 + 60))
+                end_text = SURFACE_POOL.render_text(self.font, f'Round {self.round} Complete!', True, (0, 0, 0))
+                continue_text = SURFACE_POOL.render_text(self.font, 'Tap to continue', True, (0, 0, 0))
+                text_rect = end_text.get_rect(center=(self.width / 2, self.height / 2))
+                cont_rect = continue_text.get_rect(center=(self.width / 2, self.height / 2 + 60))
                 self.temp_surface.blit(end_text, text_rect)
                 self.temp_surface.blit(continue_text, cont_rect)
 
             # Muzzle flash
             if self.flash_timer > 0 and self.game_state == 'playing':
                 if (self.flash_timer % 2) == 0:
-                    flash_surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+                    flash_surface = SURFACE_POOL.acquire((self.width, self.height))
                     flash_surface.fill((255, 255, 255))
                     flash_surface.set_alpha(128)
                     self.temp_surface.blit(flash_surface, (0, 0))
+                    SURFACE_POOL.release(flash_surface)
 
             if self.dog:
-                clip_rect = pygame.Rect(0, 0, WINDOW_WIDTH, WINDOW_HEIGHT - 100)
+                clip_rect = pygame.Rect(0, 0, self.width, self.height - 100)
                 old_clip = self.temp_surface.get_clip()
                 self.temp_surface.set_clip(clip_rect)
                 self.temp_surface.blit(self.dog.image, self.dog.rect)
                 self.temp_surface.set_clip(old_clip)
 
         # Now scale that temp_surface down and back up to produce pixelation
-        small_w = WINDOW_WIDTH // PIXEL_SCALE
-        small_h = WINDOW_HEIGHT // PIXEL_SCALE
+        small_w = self.width // PIXEL_SCALE
+        small_h = self.height // PIXEL_SCALE
+        target_size = self.screen.get_size()
 
-        # Use nearest-neighbor scaling
-        scaled_down = pygame.transform.scale(self.temp_surface, (small_w, small_h))
-        final_surface = pygame.transform.scale(scaled_down, (WINDOW_WIDTH, WINDOW_HEIGHT))
+        # Use nearest-neighbor scaling into pooled surfaces
+        scaled_down = SURFACE_POOL.acquire((small_w, small_h))
+        final_surface = SURFACE_POOL.acquire(target_size)
+        pygame.transform.scale(self.temp_surface, (small_w, small_h), scaled_down)
+        pygame.transform.scale(scaled_down, target_size, final_surface)
+        self.recorder.capture(scaled_down)
 
         self.screen.blit(final_surface, (0,0))
-        pygame.display.flip()
+        SURFACE_POOL.release(scaled_down)
+        SURFACE_POOL.release(final_surface)
+        if self.owns_display:
+            pygame.display.flip()
 
     def shoot(self, pos):
         """Shoot if ammo is available; otherwise flash reload message."""
@@ -798,70 +1893,307 @@ class DuckHunt:
                 explosion = Explosion(pos)
                 self.explosions.add(explosion)
 
+                hit_duck = None
                 for duck in self.ducks:
                     if duck.rect.collidepoint(pos) and duck.state == 'flying':
                         duck.state = 'hit'
                         self.score += duck.variant.points
                         self.ducks_hit += 1
+                        self.session_ducks_hit += 1
                         self._create_feathers(duck.rect.center)
+                        hit_duck = duck
                         break
 
                 self.ammo -= 1
 
+                if hit_duck is not None:
+                    self.telemetry.emit(
+                        "shot", game=self.game_id, round=self.round, x=pos[0], y=pos[1],
+                        hit=True, variant=hit_duck.variant_name,
+                        elapsed_ms=round((time.perf_counter() - hit_duck.spawned_at) * 1000, 1),
+                        frame_ms=self.clock.get_time(), ammo=self.ammo
+                    )
+                else:
+                    self.telemetry.emit("shot", game=self.game_id, round=self.round,
+                                        x=pos[0], y=pos[1], hit=False,
+                                        frame_ms=self.clock.get_time(), ammo=self.ammo)
+
                 # If the ammo just hit 0, show "Right click to reload!" message
                 if self.ammo == 0:
                     self.reload_flash_timer = 120  # ~2 seconds
+                    self.empty_since = time.perf_counter()
             else:
                 # Already out of ammo: re-bump the timer so it flashes again
                 self.reload_flash_timer = 120
+                self.telemetry.emit("dry_fire", game=self.game_id, round=self.round,
+                                    x=pos[0], y=pos[1],
+                                    frame_ms=self.clock.get_time(), ammo=0)
 
     def _create_feathers(self, pos):
         for _ in range(6):
             feather = Feather(*pos)
             self.feathers.add(feather)
 
+    def handle_events(self):
+        """Process pending input; returns False once the window is closed."""
+        running = True
+        for event in pygame.event.get():
+            if not self.handle_event(event):
+                running = False
+        return running
+
+    def handle_event(self, event):
+        """Apply one input event (positions in play-field coordinates)."""
+        if event.type == pygame.QUIT:
+            return False
+        elif event.type == pygame.KEYDOWN:
+            # F9 = save the last few seconds of play
+            if event.key == pygame.K_F9:
+                self.recorder.save()
+            # F10 = print the Surface memory report
+            elif event.key == pygame.K_F10:
+                print(self.memory_report().format(self.memory_peak))
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            # Left click = shoot
+            if event.button == 1:
+                if self.game_state == 'title':
+                    # Transition from title to round intro
+                    self.start_round()
+                elif self.game_state == 'playing':
+                    self.shoot(event.pos)
+                elif self.game_state == 'round_end':
+                    # Next round
+                    self.round += 1
+                    self.start_round()
+            # Right click = reload
+            elif event.button == 3:
+                if self.game_state == 'playing':
+                    # elapsed_ms: how long the player sat on an empty gun
+                    elapsed_ms = None
+                    if self.empty_since is not None:
+                        elapsed_ms = round((time.perf_counter() - self.empty_since) * 1000, 1)
+                        self.empty_since = None
+                    self.telemetry.emit("reload", game=self.game_id, round=self.round,
+                                        elapsed_ms=elapsed_ms, ammo=self.ammo)
+                    self.ammo = self.max_ammo
+                    self.reload_flash_timer = 0  # Hide reload message once reloaded
+        return True
+
+    def step(self):
+        """Advance and render one frame, plus the per-frame bookkeeping."""
+        self.update()
+        self.draw()
+        SURFACE_POOL.end_frame()
+        self.telemetry.poll()
+
+        if self.sample_memory:
+            self.memory_sample_timer += 1
+            if self.memory_sample_timer >= FPS * MEMORY_SAMPLE_SECONDS:
+                self.memory_sample_timer = 0
+                self.memory_report(find_duplicates=False)
+
+    def record_session(self):
+        self.scores.record_session(self.score, self.round, self.session_ducks_hit,
+                                   session_id=self.session_id,
+                                   started=self.session_started)
+
+    def close(self):
+        """Persist the session and stop this game's background writers."""
+        if self.game_state != 'title':
+            self.record_session()
+            self.refresh_leaderboard()
+        if self._owns_scores:
+            self.scores.close()
+        if self._owns_telemetry:
+            self.telemetry.close()
+        self.recorder.wait()
+
     def run(self):
+        # No event loop here, so coroutines held for run_async() can never run
+        pending, self._pending_coroutines = self._pending_coroutines, []
+        for coro in pending:
+            coro.close()
+
         running = True
         while running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    # Left click = shoot
-                    if event.button == 1:
-                        if self.game_state == 'title':
-                            # Transition from title to round intro
-                            self.game_state = 'playing'
-                            self.ammo = self.max_ammo
-                            self.round_show_timer = 120  # Show "Round X" for ~2 seconds
-                        elif self.game_state == 'playing':
-                            self.shoot(event.pos)
-                        elif self.game_state == 'round_end':
-                            # Next round
-                            self.round += 1
-                            self.ducks_per_round = 3 + self.round
-                            self.ducks_spawned = 0
-                            self.ducks_hit = 0
-                            self.game_state = 'playing'
-                            self.dog = None
-                            self.ammo = self.max_ammo
-                            self.round_show_timer = 120
-                    # Right click = reload
-                    elif event.button == 3:
-                        if self.game_state == 'playing':
-                            self.ammo = self.max_ammo
-                            self.reload_flash_timer = 0  # Hide reload message once reloaded
-
-            self.update()
-            self.draw()
+            running = self.handle_events()
+            self.step()
+            self.clock.tick(FPS)
+
+        self.close()
+        pygame.quit()
+
+    def schedule(self, coro):
+        """
+        Run a coroutine alongside the game. Under run_async() it starts
+        right away; otherwise it is held until run_async() begins (run()
+        closes held coroutines without running them).
+        """
+        if self._loop is None:
+            self._pending_coroutines.append(coro)
+            return None
+        task = self._loop.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _sleep_until(self, deadline):
+        # Always yield once so scheduled coroutines progress even when the
+        # frame ran over budget
+        await asyncio.sleep(0)
+        remaining = deadline - self._loop.time()
+        if remaining > 0.002:
+            await asyncio.sleep(remaining - 0.001)
+        # Finish the last millisecond by yielding rather than oversleeping
+        while self._loop.time() < deadline:
+            await asyncio.sleep(0)
+
+    async def run_async(self, frame_budget=1 / FPS, shutdown_timeout=1.0):
+        """
+        asyncio variant of run(): each frame does the usual event/update/draw
+        work, then hands the rest of its frame budget to the event loop.
+        On exit, scheduled tasks get shutdown_timeout seconds to finish
+        cancelling before the game shuts down without them.
+        """
+        self._loop = asyncio.get_running_loop()
+        pending, self._pending_coroutines = self._pending_coroutines, []
+        for coro in pending:
+            self.schedule(coro)
+
+        running = True
+        next_frame = self._loop.time()
+        while running:
+            running = self.handle_events()
+            self.step()
+            next_frame += frame_budget
+            now = self._loop.time()
+            if next_frame < now:
+                # Fell behind; don't try to catch up with a burst of frames
+                next_frame = now
+            await self._sleep_until(next_frame)
+            # Keeps clock.get_fps() meaningful without delaying
+            self.clock.tick()
+
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            await asyncio.wait(list(self._tasks), timeout=shutdown_timeout)
+        self._loop = None
+        self.close()
+        pygame.quit()
+
+class KioskHost:
+    """
+    Runs several independent DuckHunt games in one window and one process.
+    Each game keeps its own state and play field, renders into its own
+    region of the display, and shares the module-level immutable caches
+    (duck sprites, clouds, explosion frames, fonts and rendered text) plus
+    one score store and one telemetry stream, so every title screen shows
+    the combined leaderboard.
+    Games are stepped most-behind-first until the frame budget is spent,
+    so a slow frame delays them evenly instead of starving the last one.
+    """
+    def __init__(self, count, columns=None, cell_size=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2),
+                 frame_budget=1 / FPS, capture_seconds=0, persist=True):
+        self.columns = columns or math.ceil(math.sqrt(count))
+        rows = math.ceil(count / self.columns)
+        cell_w, cell_h = cell_size
+        self.screen = pygame.display.set_mode((cell_w * self.columns, cell_h * rows))
+        pygame.display.set_caption(f"Duck Hunter x{count}")
+        self.clock = pygame.time.Clock()
+        self.frame_budget = frame_budget
+
+        self.scores = ScoreStore.open() if persist else MemoryScoreStore()
+        self.telemetry = Telemetry(self.scores.session_id) if persist else NullTelemetry()
+
+        self.regions = []
+        self.games = []
+        for i in range(count):
+            region = pygame.Rect((i % self.columns) * cell_w, (i // self.columns) * cell_h,
+                                 cell_w, cell_h)
+            # Subsurfaces share the display's pixels, so there is no composite pass
+            target = self.screen.subsurface(region)
+            self.regions.append(region)
+            self.games.append(DuckHunt(
+                target=target, capture_seconds=capture_seconds,
+                scores=self.scores, telemetry=self.telemetry, game_id=i
+            ))
+        # Frames each game is behind the host, for fair scheduling
+        self.lag = [0] * count
+
+    def game_at(self, pos):
+        """The game under a window position and the position in its play field."""
+        for region, game in zip(self.regions, self.games):
+            if region.collidepoint(pos):
+                x = (pos[0] - region.x) * game.width // region.width
+                y = (pos[1] - region.y) * game.height // region.height
+                return game, (x, y)
+        return None, None
+
+    def handle_events(self):
+        running = True
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                game, local_pos = self.game_at(event.pos)
+                if game is not None:
+                    game.handle_event(pygame.event.Event(
+                        pygame.MOUSEBUTTONDOWN, button=event.button, pos=local_pos
+                    ))
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F10:
+                print(self.memory_report().format())
+            elif event.type == pygame.KEYDOWN:
+                for game in self.games:
+                    game.handle_event(event)
+        return running
+
+    def step(self):
+        """Step games most-behind-first until the frame budget runs out."""
+        deadline = time.perf_counter() + self.frame_budget
+        order = sorted(range(len(self.games)), key=lambda i: -self.lag[i])
+        for n, i in enumerate(order):
+            # Always step at least one game so the host cannot stall
+            if n and time.perf_counter() >= deadline:
+                self.lag[i] += 1
+                continue
+            game = self.games[i]
+            game.step()
+            # Per-game frame time (covers any frames it was skipped for)
+            game.clock.tick()
+            self.lag[i] = 0
+
+    def memory_report(self, find_duplicates=True):
+        return MemoryReport(*self.games, DuckSprites, Explosion, Environment, SURFACE_POOL,
+                            find_duplicates=find_duplicates)
+
+    def run(self):
+        running = True
+        while running:
+            running = self.handle_events()
+            self.step()
+            pygame.display.flip()
             self.clock.tick(FPS)
 
+        for game in self.games:
+            game.close()
+        self.telemetry.close()
+        self.scores.close()
         pygame.quit()
 
 def main():
     pygame.mixer.init()
-    game = DuckHunt()
-    game.run()
+    if '--kiosk' in sys.argv:
+        # --kiosk N: N independent games in one window
+        index = sys.argv.index('--kiosk')
+        count = int(sys.argv[index + 1]) if index + 1 < len(sys.argv) else 4
+        KioskHost(count).run()
+        return
+    game = DuckHunt(sample_memory='--memory-peak' in sys.argv)
+    if '--async' in sys.argv:
+        asyncio.run(game.run_async())
+    else:
+        game.run()
 
 if __name__ == '__main__':
     main()
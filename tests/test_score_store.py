@@ -0,0 +1,31 @@
+import os
+import sqlite3
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import FowlHunter
+
+
+def test_failed_batch_does_not_stop_writer(tmp_path):
+    path = str(tmp_path / "scores.db")
+    store = FowlHunter.ScoreStore(path, batch_size=1)
+    store._enqueue(("INSERT INTO missing_table VALUES (?)", (1,)))
+    store.record_round(1, 500, 10, 10)
+    store.close()
+
+    assert store.failed_writes == 1
+    with sqlite3.connect(path) as conn:
+        rows = conn.execute("SELECT round, score FROM rounds").fetchall()
+    assert rows == [(1, 500)]
+
+
+def test_open_falls_back_to_memory_store(tmp_path):
+    blocker = tmp_path / "not_a_dir"
+    blocker.write_text("")
+    store = FowlHunter.ScoreStore.open(str(blocker / "scores.db"))
+
+    assert isinstance(store, FowlHunter.MemoryScoreStore)
+    store.record_session(700, 3, 20)
+    assert [entry.score for entry in store.leaderboard()] == [700]
+    store.close()
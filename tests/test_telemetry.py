@@ -0,0 +1,43 @@
+import gzip
+import json
+import os
+import threading
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import FowlHunter
+
+
+def test_write_failure_drops_batch_and_close_returns(tmp_path):
+    # A directory under a regular file can never be created
+    blocker = tmp_path / "not_a_dir"
+    blocker.write_text("")
+    telemetry = FowlHunter.Telemetry(
+        "x", directory=str(blocker / "telemetry"), flush_interval=0, close_timeout=2.0
+    )
+    telemetry.emit("shot", x=1, y=2)
+    telemetry.poll()
+    telemetry.emit("shot", x=3, y=4)
+
+    closer = threading.Thread(target=telemetry.close, daemon=True)
+    closer.start()
+    closer.join(5)
+
+    assert not closer.is_alive()
+    assert not telemetry._writer.is_alive()
+    assert telemetry.dropped == 2
+
+
+def test_events_written_after_close(tmp_path):
+    telemetry = FowlHunter.Telemetry("x", directory=str(tmp_path), flush_interval=0)
+    telemetry.emit("shot", round=1, hit=True)
+    telemetry.poll()
+    telemetry.emit("reload", round=1, ammo=3)
+    telemetry.close()
+
+    (path,) = tmp_path.iterdir()
+    with gzip.open(path, "rt") as stream:
+        events = [json.loads(line)["event"] for line in stream]
+    assert events == ["shot", "reload"]
+    assert telemetry.dropped == 0